@@ -5,45 +5,74 @@
 Aplicação para enviar mensagens para RabbitMQ com headers customizados
 """
 
+import argparse
+import copy
+import functools
+import os
 import pika
-import time
 import sys
 import logging
-import json
 import random
 from datetime import datetime, timezone
 from contextlib import contextmanager
+import orjson
 import config
 from producer import MessageProducer
-import uuid
+from rabbitmq_client import ChannelPool, RabbitMQClient, close_cached_connections, get_cached_connection
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
 def create_connection_params():
-    """Creates and returns connection parameters for RabbitMQ server"""
+    """
+    Creates and returns connection parameters for RabbitMQ server
+    
+    The result is cached: config values do not change at runtime, so the same
+    (read-only) parameters object is shared by every connection of the process.
+    """
     credentials = pika.PlainCredentials(config.USERNAME, config.PASSWORD)
     return pika.ConnectionParameters(
         host=config.HOST,
         port=config.PORT,
         virtual_host=config.VIRTUAL_HOST,
-        credentials=credentials
+        credentials=credentials,
+        heartbeat=config.HEARTBEAT,
+        socket_timeout=config.SOCKET_TIMEOUT
     )
 
 
+# Conexão única do processo ("1 connection - n channels"), compartilhada pelo cache de
+# conexões do rabbitmq_client, e pool de canais sobre ela
+_CHANNEL_POOL = ChannelPool(create_connection_params())
+
+
+def get_connection():
+    """Returns the process-wide RabbitMQ connection, (re)connecting on first use"""
+    return get_cached_connection(create_connection_params())
+
+
+def get_channel():
+    """
+    Context manager that borrows a channel from the pool and returns it afterwards
+    
+    Yields:
+        pika.adapters.blocking_connection.BlockingChannel: An open channel on the shared connection
+    """
+    return _CHANNEL_POOL.channel()
+
+
+def close_connection():
+    """Closes the shared connection; pooled channels are closed along with it"""
+    close_cached_connections()
+    logger.info("RabbitMQ connection closed")
+
+
 @contextmanager
 def rabbitmq_connection():
-    """Context manager for RabbitMQ connection to ensure proper cleanup"""
-    connection = None
+    """Context manager for the shared RabbitMQ connection to ensure proper cleanup"""
     try:
-        # Create connection
-        connection_params = create_connection_params()
-        connection = pika.BlockingConnection(connection_params)
+        connection = get_connection()
         logger.info("Connected to RabbitMQ successfully")
         yield connection
     except pika.exceptions.AMQPConnectionError as e:
@@ -51,230 +80,414 @@ def rabbitmq_connection():
         raise
     finally:
         # Ensure connection is closed
-        if connection and connection.is_open:
-            connection.close()
-            logger.info("RabbitMQ connection closed")
+        close_connection()
+
 
+# Gerador de trade IDs próprio do módulo, semeado pelo SO, para não disputar o estado
+# global do módulo random a cada envio
+_rng = random.Random(int.from_bytes(os.urandom(8), 'big'))
 
-def send_message_with_headers(producer, exchange, routing_key, queue):
+
+def _uuid4_str():
     """
-    Envia uma mensagem com headers customizados para o RabbitMQ
+    Gera um UUID versão 4 (RFC 4122) já em texto
+    
+    Equivalente a str(uuid.uuid4()), mas formatado direto dos bytes aleatórios,
+    sem instanciar e validar um uuid.UUID a cada mensagem.
+    """
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40  # versão 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # variante RFC 4122
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+# Backoffice status
+BACKOFFICE_STATUS = "test.qa.123"
+
+# Corpo da mensagem baseado no exemplo fornecido. Só é usado na importação para montar
+# _MSG_TEMPLATE: os campos marcados com None viram marcadores substituídos a cada envio
+# em build_message (não modificar)
+_MESSAGE_TEMPLATE = {
+    "pnl": {
+        "party": {
+            "book": {"name": "CUSTODY", "reference": "313"}, 
+            "operator": {"name": "CUSTODY", "reference": "12234"}, 
+            "strategy": {"name": "CUSTODY", "reference": "31551"}
+        }, 
+        "counterparty": {
+            "book": {"name": "Private", "reference": "186"}, 
+            "operator": {"name": "PRIVATE", "reference": "1698"}, 
+            "strategy": {"name": "PRIVATE BRAZIL", "reference": "29980"}
+        }
+    }, 
+    "rate": {"post": 75.0, "fixed": 0.0, "index": "DI"}, 
+    "tags": ["Avista", "Comercial"], 
+    "type": "Unblock", 
+    "asset": {
+        "rate": {"post": 100.0, "fixed": 0.0, "index": "IGPM"}, 
+        "type": "Bond", 
+        "issuer": {
+            "cge": 113121, 
+            "name": "PLANETA SECURITIZADORA SA", 
+            "document": "07587384000130"
+        }, 
+        "subType": "CRI", 
+        "clearing": "CETIP", 
+        "codAtivo": 550954, 
+        "fullName": "12F0036335 13/01/2033", 
+        "exception": True, 
+        "issueDate": "2012-06-14", 
+        "shortName": "12F0036335", 
+        "maturityDate": "2033-01-13", 
+        "referenceType": "ISIN", 
+        "referenceValue": "BRGAIACRI261", 
+        "accountingGroup": "CRI", 
+        "rateResetFrequency": {"value": 1, "unit": "Month"},
+        "calculationConvention": "buss/252",
+        "earlyTerminationCondition": {
+            "rate": {"post": 75.0, "fixed": 0.0, "index": "DI"}, 
+            "custody": {
+                "name": "BANCO BTG PACTUAL S.A.", 
+                "type": "PJ", 
+                "agency": "1", 
+                "isFund": False, 
+                "account": "000009300", 
+                "foreing": False, 
+                "document": "30306294000145", 
+                "cashImpact": False, 
+                "accountType": "CC", 
+                "isPortfolio": False, 
+                "clearingAccount": "72080003", 
+                "internalCustody": True, 
+                "isOmnibusAccount": False, 
+                "isBtgConglomerate": True
+            }, 
+            "position": 1000, 
+            "reference": "POSITION", 
+            "unitaryPrice": 765.66035715, 
+            "cashSettlement": 765660.36, 
+            "netCashSettlement": 765660.36
+        }
+    }, 
+    "quote": None, 
+    "source": "Asset", 
+    "status": "Matched", 
+    "tradeId": None,
+    "version": 1, 
+    "custody": {
+        "name": "BANCO BTG PACTUAL S.A.", 
+        "type": "PJ", 
+        "agency": "1", 
+        "isFund": False, 
+        "account": "000009300", 
+        "foreing": False, 
+        "document": "30306294000145", 
+        "cashImpact": False, 
+        "accountType": "CC", 
+        "isPortfolio": False, 
+        "clearingAccount": "72080003", 
+        "internalCustody": True, 
+        "isOmnibusAccount": False, 
+        "isBtgConglomerate": True
+    }, 
+    "extendedType": "BLOQUEIO_JUDICIAL", 
+    "unitaryPrice": 765.66035715, 
+    "objUpdateTime": None,
+    "cashSettlement": 42876.98, 
+    "backofficeStatus": BACKOFFICE_STATUS,
+    "creationDateTime": None, 
+    "referencePerAcquisition": None
+}
+
+_QUOTE_TEMPLATE = {
+    "id": "1694792300", 
+    "priority": 1, 
+    "creationDateTime": None,  
+    "lastCheckDateTime": None
+}
+
+_ACQUISITION_TEMPLATE = {
+    "buyDate": None, 
+    "buyRate": {"post": 75.0, "fixed": 0.0, "index": "DI"}, 
+    "quantity": 1000, 
+    "reference": "100502982", 
+    "originType": "Buy", 
+    "enteredDate": None, 
+    "cashSettlement": 42876.98, 
+    "buyUnitaryPrice": 765.66035715, 
+    "netCashSettlement": 42876.98
+}
+
+# Corpo completo serializado uma única vez, com sentinelas nos campos dinâmicos. A cada
+# envio as sentinelas (incluindo as aspas) são trocadas pelos valores já em JSON
+_UPDATE_TIME_SENTINEL = b'"__UPDATE_TIME__"'
+_TRADE_ID_SENTINEL = b'"__TRADE_ID__"'
+_BUY_DATE_SENTINEL = b'"__BUY_DATE__"'
+
+_MSG_TEMPLATE = orjson.dumps({
+    **_MESSAGE_TEMPLATE,
+    "quote": {**_QUOTE_TEMPLATE, "creationDateTime": "__UPDATE_TIME__", "lastCheckDateTime": "__UPDATE_TIME__"},
+    "tradeId": "__TRADE_ID__",
+    "objUpdateTime": "__UPDATE_TIME__",
+    "creationDateTime": "__UPDATE_TIME__",
+    "referencePerAcquisition": [
+        {**_ACQUISITION_TEMPLATE, "buyDate": "__BUY_DATE__", "enteredDate": "__UPDATE_TIME__"}
+    ]
+})
+
+# Headers customizados conforme a tabela (campos None são preenchidos a cada envio)
+_HEADERS_TEMPLATE = {
+    # Headers de atributos conforme a imagem
+    "event.layout": "panorama-trade-v1",
+    "objectType": "position_trade",
+    "productType": "emissao_emissao1_efic",
+    "account": "00009300",
+    "accountingGroup": "CDB",
+    "tradeType": "buy",
+    "eventType": BACKOFFICE_STATUS,
+    "eventId": None,
+    "correlationId": None,
+    "eventDate": None,
+    "eventReferenceDate": None,
+
+    # Headers adicionais para processamento
+    "content-type": "application/json",
+    "app-id": "python-rabbitmq-poc",
+    "timestamp": None,
+    "x-trade-id": None,
+    "x-backoffice-status": BACKOFFICE_STATUS
+}
+
+# Propriedades AMQP comuns a todas as mensagens de trade. A cada envio é feita uma
+# cópia rasa e apenas o dicionário de headers é trocado
+_PROPS_PROTOTYPE = pika.BasicProperties(
+    content_type="application/json",
+    app_id="python-rabbitmq-poc",
+    delivery_mode=1,  # transiente; ver build_message(persistent=True)
+    headers=_HEADERS_TEMPLATE
+)
+
+
+def build_message(persistent=False):
+    """
+    Monta o corpo (JSON em bytes) e as propriedades (com headers customizados) de uma mensagem de trade
     
     Args:
-        producer (MessageProducer): Instância do produtor
-        exchange (str): Nome da exchange
-        routing_key (str): Routing key
-        queue (str): Nome da fila
+        persistent (bool, optional): Marca a mensagem como persistente (delivery_mode=2), o que
+                                     exige gravação em disco no broker. Padrão False
+    
+    Returns:
+        tuple: (message, properties) prontos para o MessageProducer
     """
     # Gerar um trade ID (número inteiro aleatório)
-    trade_id = random.randint(100000000000, 999999999999)
+    trade_id = _rng.randrange(100_000_000_000, 1_000_000_000_000)
     
     # Gerar um UUID para o eventId
-    event_id = str(uuid.uuid4())
+    event_id = _uuid4_str()
+    
+    # Instante atual (UTC). Os formatos texto do corpo e dos headers são derivados
+    # de uma única string ISO 8601 com milissegundos
+    now = datetime.now(timezone.utc)
+    iso = now.isoformat(timespec='milliseconds')  # 2025-05-05T11:45:23.456+00:00
     
     # Timestamp atual em formato ISO 8601 UTC (Zulu)
-    update_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+    update_time = iso[:23] + 'Z'
     
     # Data atual para eventDate em formato UTC
-    event_date = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+    event_date = iso[:23].replace('T', ' ')
     
     # Data de referência para eventReferenceDate
-    event_reference_date = datetime.now(timezone.utc).strftime('%Y-%m-%d')
-    
-    # Backoffice status
-    backoffice_status = "test.qa.123"
+    event_reference_date = iso[:10]
     
-    # Mensagem em formato JSON baseada no exemplo fornecido
-    message_body = {
-        "pnl": {
-            "party": {
-                "book": {"name": "CUSTODY", "reference": "313"}, 
-                "operator": {"name": "CUSTODY", "reference": "12234"}, 
-                "strategy": {"name": "CUSTODY", "reference": "31551"}
-            }, 
-            "counterparty": {
-                "book": {"name": "Private", "reference": "186"}, 
-                "operator": {"name": "PRIVATE", "reference": "1698"}, 
-                "strategy": {"name": "PRIVATE BRAZIL", "reference": "29980"}
-            }
-        }, 
-        "rate": {"post": 75.0, "fixed": 0.0, "index": "DI"}, 
-        "tags": ["Avista", "Comercial"], 
-        "type": "Unblock", 
-        "asset": {
-            "rate": {"post": 100.0, "fixed": 0.0, "index": "IGPM"}, 
-            "type": "Bond", 
-            "issuer": {
-                "cge": 113121, 
-                "name": "PLANETA SECURITIZADORA SA", 
-                "document": "07587384000130"
-            }, 
-            "subType": "CRI", 
-            "clearing": "CETIP", 
-            "codAtivo": 550954, 
-            "fullName": "12F0036335 13/01/2033", 
-            "exception": True, 
-            "issueDate": "2012-06-14", 
-            "shortName": "12F0036335", 
-            "maturityDate": "2033-01-13", 
-            "referenceType": "ISIN", 
-            "referenceValue": "BRGAIACRI261", 
-            "accountingGroup": "CRI", 
-            "rateResetFrequency": {"value": 1, "unit": "Month"},
-            "calculationConvention": "buss/252",
-            "earlyTerminationCondition": {
-                "rate": {"post": 75.0, "fixed": 0.0, "index": "DI"}, 
-                "custody": {
-                    "name": "BANCO BTG PACTUAL S.A.", 
-                    "type": "PJ", 
-                    "agency": "1", 
-                    "isFund": False, 
-                    "account": "000009300", 
-                    "foreing": False, 
-                    "document": "30306294000145", 
-                    "cashImpact": False, 
-                    "accountType": "CC", 
-                    "isPortfolio": False, 
-                    "clearingAccount": "72080003", 
-                    "internalCustody": True, 
-                    "isOmnibusAccount": False, 
-                    "isBtgConglomerate": True
-                }, 
-                "position": 1000, 
-                "reference": "POSITION", 
-                "unitaryPrice": 765.66035715, 
-                "cashSettlement": 765660.36, 
-                "netCashSettlement": 765660.36
-            }
-        }, 
-        "quote": {
-            "id": "1694792300", 
-            "priority": 1, 
-            "creationDateTime": update_time,  
-            "lastCheckDateTime": update_time
-        }, 
-        "source": "Asset", 
-        "status": "Matched", 
-        "tradeId": str(trade_id),
-        "version": 1, 
-        "custody": {
-            "name": "BANCO BTG PACTUAL S.A.", 
-            "type": "PJ", 
-            "agency": "1", 
-            "isFund": False, 
-            "account": "000009300", 
-            "foreing": False, 
-            "document": "30306294000145", 
-            "cashImpact": False, 
-            "accountType": "CC", 
-            "isPortfolio": False, 
-            "clearingAccount": "72080003", 
-            "internalCustody": True, 
-            "isOmnibusAccount": False, 
-            "isBtgConglomerate": True
-        }, 
-        "extendedType": "BLOQUEIO_JUDICIAL", 
-        "unitaryPrice": 765.66035715, 
-        "objUpdateTime": update_time,
-        "cashSettlement": 42876.98, 
-        "backofficeStatus": backoffice_status,
-        "creationDateTime": update_time, 
-        "referencePerAcquisition": [
-            {
-                "buyDate": datetime.now(timezone.utc).strftime('%Y-%m-%d'), 
-                "buyRate": {"post": 75.0, "fixed": 0.0, "index": "DI"}, 
-                "quantity": 1000, 
-                "reference": "100502982", 
-                "originType": "Buy", 
-                "enteredDate": update_time, 
-                "cashSettlement": 42876.98, 
-                "buyUnitaryPrice": 765.66035715, 
-                "netCashSettlement": 42876.98
-            }
-        ]
-    }
+    # Corpo: substituição das sentinelas no template já serializado
+    message = (
+        _MSG_TEMPLATE
+        .replace(_UPDATE_TIME_SENTINEL, b'"%s"' % update_time.encode())
+        .replace(_TRADE_ID_SENTINEL, b'"%d"' % trade_id)
+        .replace(_BUY_DATE_SENTINEL, b'"%s"' % iso[:10].encode())
+    )
     
-    # Headers customizados conforme a tabela
-    headers = {
-        # Headers de atributos conforme a imagem
-        "event.layout": "panorama-trade-v1",
-        "objectType": "position_trade",
-        "productType": "emissao_emissao1_efic",
-        "account": "00009300",
-        "accountingGroup": "CDB",
-        "tradeType": "buy",
-        "eventType": backoffice_status,
+    properties = copy.copy(_PROPS_PROTOTYPE)
+    if persistent:
+        properties.delivery_mode = 2
+    properties.headers = {
+        **_HEADERS_TEMPLATE,
         "eventId": event_id,
         "correlationId": f"custody-engine-{event_reference_date}",
         "eventDate": event_date,
         "eventReferenceDate": event_reference_date,
-        
-        # Headers adicionais para processamento
-        "content-type": "application/json",
-        "app-id": "python-rabbitmq-poc",
         "timestamp": update_time,
-        "x-trade-id": str(trade_id),
-        "x-backoffice-status": backoffice_status
+        "x-trade-id": trade_id  # int: codificado como signed long (tipo 'l'), sem conversão para texto
     }
     
-    # Converter para string JSON
-    message = json.dumps(message_body)
+    return message, properties
+
+
+def send_message_with_headers(producer, exchange, routing_key, queue, count=1, batch_size=64,
+                              persistent=False):
+    """
+    Envia mensagens com headers customizados para o RabbitMQ
     
+    Args:
+        producer (MessageProducer): Instância do produtor
+        exchange (str): Nome da exchange
+        routing_key (str): Routing key
+        queue (str): Nome da fila
+        count (int, optional): Quantidade de mensagens a enviar. Padrão 1
+        batch_size (int, optional): Mensagens publicadas por confirmação do broker
+                                    quando count > 1. Padrão 64
+        persistent (bool, optional): Envia mensagens persistentes (delivery_mode=2). Padrão False
+    """
     try:
-        logger.info(f"Enviando mensagem para exchange '{exchange}' com routing key '{routing_key}'")
-        logger.debug(f"Trade ID: {trade_id}")
-        logger.debug(f"Event ID: {event_id}")
-        logger.debug(f"Object Update Time: {update_time}")
-        logger.debug(f"Backoffice Status: {backoffice_status}")
+        # Formatação adiada (estilo %) e protegida pelo nível de log: nada é montado
+        # quando INFO/DEBUG estão desabilitados
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Enviando mensagem para exchange '%s' com routing key '%s'", exchange, routing_key)
         
-        producer.send_message(exchange, routing_key, message, headers)
+        if count == 1:
+            message, properties = build_message(persistent)
+            headers = properties.headers
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Trade ID: %s", headers['x-trade-id'])
+                logger.debug("Event ID: %s", headers['eventId'])
+                logger.debug("Object Update Time: %s", headers['timestamp'])
+                logger.debug("Backoffice Status: %s", headers['x-backoffice-status'])
+            
+            future = producer.send_message(exchange, routing_key, message, properties=properties)
+            if future is not None:
+                future.result(producer.operation_timeout)  # Modo select: aguarda a confirmação do broker
+        else:
+            # Publica em lotes, aguardando uma única confirmação do broker por lote
+            messages = (build_message(persistent) for _ in range(count))
+            producer.send_batch(exchange, routing_key, messages, batch_size=batch_size)
         
         logger.info("Mensagem enviada com sucesso")
     except Exception as e:
-        logger.error(f"Erro ao enviar mensagem: {e}")
+        logger.error("Erro ao enviar mensagem: %s", e)
         raise
 
 
-def main():
+def send_stdin_messages(producer, exchange, routing_key, batch_size=100, stream=None, persistent=False):
+    """
+    Publica cada linha não vazia da entrada padrão como uma mensagem, em lotes
+    
+    As linhas são lidas sob demanda e publicadas sem esperar confirmação individual;
+    uma única confirmação do broker é aguardada a cada batch_size mensagens.
+    
+    Args:
+        producer (MessageProducer): Instância do produtor
+        exchange (str): Nome da exchange
+        routing_key (str): Routing key
+        batch_size (int, optional): Mensagens publicadas por confirmação do broker. Padrão 100
+        stream (binary file, optional): Origem das mensagens. Padrão sys.stdin.buffer
+        persistent (bool, optional): Envia mensagens persistentes (delivery_mode=2). Padrão False
+    
+    Returns:
+        int: Quantidade de mensagens enviadas
+    """
+    stream = stream if stream is not None else sys.stdin.buffer
+    lines = (line.rstrip(b"\r\n") for line in stream)
+    messages = ((line, None) for line in lines if line)
+    
+    sent = producer.send_batch(exchange, routing_key, messages, batch_size=batch_size, persistent=persistent)
+    logger.info("%d mensagens lidas da entrada padrão enviadas", sent)
+    return sent
+
+
+def _positive_int(value):
+    """Tipo do argparse para inteiros maiores ou iguais a 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"valor inteiro inválido: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"o valor deve ser maior ou igual a 1: {number}")
+    return number
+
+
+def parse_args(argv=None):
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(description="Envia mensagens com headers customizados para o RabbitMQ")
+    parser.add_argument("--count", type=_positive_int, default=1,
+                        help="quantidade de mensagens de trade a gerar (padrão: 1)")
+    parser.add_argument("--batch-size", type=_positive_int, default=100,
+                        help="mensagens publicadas por confirmação do broker (padrão: 100)")
+    parser.add_argument("--stdin", action="store_true",
+                        help="publica cada linha da entrada padrão como uma mensagem, em lotes")
+    parser.add_argument("--persistent", action="store_true",
+                        help="envia mensagens persistentes (delivery_mode=2); padrão: transientes")
+    parser.add_argument("--select", action="store_true",
+                        help="publica por uma SelectConnection com confirmações assíncronas")
+    return parser.parse_args(argv)
+
+
+def run(producer, args, exchange, routing_key, queue):
+    """
+    Configura exchange, fila e binding e envia as mensagens pedidas na linha de comando
+    
+    Args:
+        producer (MessageProducer): Instância do produtor (bloqueante ou select)
+        args (argparse.Namespace): Argumentos de linha de comando
+        exchange (str): Nome da exchange
+        routing_key (str): Routing key
+        queue (str): Nome da fila
+    """
+    # Declara a exchange (topic), a fila e o binding em um único round trip: só a
+    # resposta do binding é aguardada, as declarações anteriores vão sem espera (nowait)
+    producer.setup({
+        'exchanges': [(exchange, 'topic')],
+        'queues': [queue],
+        'bindings': [(queue, exchange, routing_key)]
+    })
+    
+    logger.info("Exchange, queue e binding configurados com sucesso")
+    
+    if args.stdin:
+        # Modo não interativo: mensagens lidas da entrada padrão
+        send_stdin_messages(producer, exchange, routing_key, batch_size=args.batch_size,
+                            persistent=args.persistent)
+    else:
+        # Envia a(s) mensagem(ns) com headers
+        send_message_with_headers(producer, exchange, routing_key, queue,
+                                  count=args.count, batch_size=args.batch_size,
+                                  persistent=args.persistent)
+
+
+def main(argv=None):
     """Função principal para executar o envio de mensagem para RabbitMQ"""
+    args = parse_args(argv)
     try:
         # Definir variáveis para exchange, routing key e queue
         exchange = config.TRADE_EXCHANGE
         routing_key = config.ROUTING_KEY
         queue = config.QUEUE_NAME
         
-        logger.info(f"Usando exchange: {exchange}")
-        logger.info(f"Usando routing key: {routing_key}")
-        logger.info(f"Enviando para queue: {queue}")
+        logger.info("Usando exchange: %s", exchange)
+        logger.info("Usando routing key: %s", routing_key)
+        logger.info("Enviando para queue: %s", queue)
         
-        with rabbitmq_connection() as connection:
-            # Inicializa o produtor
-            producer = MessageProducer(connection=connection)
-            
-            # Declara a exchange como tipo topic
-            producer.declare_exchange(exchange, exchange_type='topic')
-            
-            # Declara a fila
-            producer.declare_queue(queue)
-            
-            # Vincula a fila à exchange com a routing key
-            producer.bind_queue(queue, exchange, routing_key)
-            
-            logger.info("Exchange, queue e binding configurados com sucesso")
-            
-            # Envia a mensagem com headers
-            send_message_with_headers(producer, exchange, routing_key, queue)
-            
-            logger.info("Aplicação finalizada com sucesso")
-            print("\nMensagem enviada com sucesso. Aplicação finalizada.")
+        if args.select:
+            # Conexão assíncrona própria: as publicações não bloqueiam esperando o broker
+            producer = MessageProducer(connection_params=create_connection_params(), use_select=True)
+            try:
+                run(producer, args, exchange, routing_key, queue)
+            finally:
+                producer.close()
+        else:
+            with rabbitmq_connection(), get_channel() as channel:
+                # Inicializa o produtor sobre um canal do pool
+                run(MessageProducer(channel=channel), args, exchange, routing_key, queue)
+        
+        logger.info("Aplicação finalizada com sucesso")
     except KeyboardInterrupt:
         logger.info("Aplicação terminada pelo usuário")
-        print("\nAplicação terminada pelo usuário")
     except Exception as e:
-        logger.error(f"Erro na aplicação RabbitMQ: {e}")
-        print(f"Erro na aplicação RabbitMQ: {e}")
+        logger.error("Erro na aplicação RabbitMQ: %s", e)
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    # Configure logging only when run as a script, so importing this module has no side effects
+    RabbitMQClient.configure_logging()
     main()
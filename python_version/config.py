@@ -12,6 +12,10 @@ USERNAME = "guest"
 PASSWORD = "guest"
 VIRTUAL_HOST = "/"
 
+# Connection tuning (seconds). pika already disables Nagle (TCP_NODELAY) on its sockets
+HEARTBEAT = 60
+SOCKET_TIMEOUT = 5
+
 # Exchange name - trade inbound
 TRADE_EXCHANGE = "ex.trade.standard.corporatebond"
 
@@ -7,69 +7,242 @@ Consumer module for receiving messages from RabbitMQ
 
 import pika
 import logging
+import signal
+import sys
+import threading
 from rabbitmq_client import RabbitMQClient
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Acknowledge deliveries in groups of up to ACK_BATCH messages (multiple=True),
+# flushing whatever is pending after ACK_FLUSH_INTERVAL seconds
+ACK_BATCH = 50
+ACK_FLUSH_INTERVAL = 0.2
+
+_MENU = (
+    "\nSelect exchange type to send message:\n"
+    "1. Direct Exchange\n"
+    "2. Fanout Exchange\n"
+    "3. Topic Exchange\n"
+    "0. Exit\n"
+    "Enter your choice: "
+)
+
 
 class MessageConsumer(RabbitMQClient):
     """Consumer class for receiving messages from RabbitMQ"""
     
-    def __init__(self, connection=None, connection_params=None):
+    def __init__(self, connection=None, connection_params=None, prefetch_count=100, ack_batch=ACK_BATCH,
+                 use_select=False, interactive=True, transform=None, jit_transform=False):
         """
         Initialize with either an existing connection or connection parameters
         
         Args:
             connection (pika.BlockingConnection, optional): Existing connection
             connection_params (pika.ConnectionParameters, optional): Connection parameters
+            prefetch_count (int, optional): Maximum number of unacknowledged messages
+                delivered per consumer. 0 means unbounded (batch draining).
+            ack_batch (int, optional): Number of messages acknowledged at once.
+                Capped at prefetch_count so the broker never stalls waiting for acks.
+            use_select (bool, optional): Consume through an asynchronous pika.SelectConnection.
+                                         Consumers are started once the channel opens and
+                                         run() drives the ioloop. Requires connection_params
+            interactive (bool, optional): Print each received message and the menu to stdout.
+                                          Disable for high-throughput consumers
+            transform (callable, optional): Applied to every message body before it is handled.
+                Returns the new body (any bytes-like object), or None to acknowledge and
+                drop the message
+            jit_transform (bool, optional): Compile transform with numba.njit(cache=True, nogil=True).
+                The compiled function receives the body as a read-only uint8 numpy array and
+                should return a uint8 array. Requires numba
         """
-        super().__init__(connection_params=connection_params, connection=connection)
+        self.prefetch_count = prefetch_count
+        self.interactive = interactive
+        self.transform = self._compile_transform(transform) if transform and jit_transform else transform
+        self.ack_batch = min(ack_batch, prefetch_count) if prefetch_count else ack_batch
         self.active_consumers = {}
+        self._pending_consumers = []  # (queue_name, consumer_tag) waiting for the select channel
+        self._pending_acks = 0
+        self._last_delivery_tag = None
+        self._ack_timer = None
+        self._channel_error = None  # select mode: why the broker closed the channel, raised by run()
+        super().__init__(connection_params=connection_params, connection=connection, use_select=use_select)
+    
+    @staticmethod
+    def _compile_transform(transform):
+        """
+        JIT-compiles a body transform with numba, releasing the GIL while it runs
+        
+        Compiled code is cached on disk (cache=True), so the compile cost is paid once.
+        
+        Args:
+            transform (callable): Function taking and returning a uint8 array
+        
+        Returns:
+            callable: Wrapper taking the raw body (bytes)
+        """
+        try:
+            import numba
+            import numpy
+        except ImportError as e:
+            raise ImportError("jit_transform requires numba and numpy: pip install numba") from e
+        
+        compiled = numba.njit(cache=True, nogil=True)(transform)
+        
+        def run_compiled(body):
+            # Zero-copy view of the body as uint8[:]
+            return compiled(numpy.frombuffer(body, dtype=numpy.uint8))
+        
+        return run_compiled
+    
+    def _on_channel_open(self, channel):
+        """Starts the consumers that were requested before the select channel was open"""
+        super()._on_channel_open(channel)
+        pending, self._pending_consumers = self._pending_consumers, []
+        for queue_name, consumer_tag in pending:
+            self._basic_consume(channel, queue_name, consumer_tag)
+    
+    def _on_channel_closed(self, channel, reason):
+        """
+        Closes the select connection when the broker closes the channel (e.g. 404 on a missing queue)
+        
+        Without a channel the ioloop would keep running with no consumers, so run() would never
+        return. The reason is kept and raised by run() once the ioloop stops.
+        """
+        super()._on_channel_closed(channel, reason)
+        # Unacknowledged deliveries are redelivered by the broker; drop the pending batch
+        if self._ack_timer is not None:
+            self._remove_timeout(self._ack_timer)
+            self._ack_timer = None
+        self._pending_acks = 0
+        self._last_delivery_tag = None
+        if isinstance(reason, pika.exceptions.ChannelClosedByClient):
+            return  # Closed by _shutdown/close()
+        
+        logger.error("RabbitMQ channel closed by the broker: %s", reason)
+        self._channel_error = reason
+        if self.connection.is_open:
+            self.connection.close()
     
     def start_consuming(self, queue_name, consumer_tag):
         """
         Starts consuming messages from a specific queue
         
+        In select mode the consumer is registered from the ioloop once the channel is open.
+        
         Args:
             queue_name (str): Name of the queue to consume from
             consumer_tag (str): Identifier for this consumer
         """
-        logger.info(f"Starting consumer '{consumer_tag}' for queue: {queue_name}")
-        print(f"Starting consumer '{consumer_tag}' for queue: {queue_name}")
+        logger.info("Starting consumer '%s' for queue: %s", consumer_tag, queue_name)
         
-        # Set prefetch count to 1 to ensure fair dispatch
-        with self.channel_operation() as channel:
-            channel.basic_qos(prefetch_count=1)
-            
-            def callback(ch, method, properties, body):
-                """Callback function for processing received messages"""
-                try:
-                    message = body.decode('utf-8')
-                    
-                    # Extract headers from properties if available
-                    headers = properties.headers if properties and hasattr(properties, 'headers') else None
-                    
+        if self.use_select:
+            if self.channel is None:
+                self._pending_consumers.append((queue_name, consumer_tag))
+            else:
+                self.call_threadsafe(self._basic_consume, self.channel, queue_name, consumer_tag)
+            return
+        
+        self._with_channel(self._basic_consume, queue_name, consumer_tag)
+    
+    def _basic_consume(self, channel, queue_name, consumer_tag):
+        """
+        Sets the prefetch window and registers the delivery callback on the channel
+        
+        Args:
+            channel (pika.channel.Channel): Blocking or asynchronous channel
+            queue_name (str): Name of the queue to consume from
+            consumer_tag (str): Identifier for this consumer
+        """
+        # Let the broker keep up to prefetch_count messages in flight per consumer
+        channel.basic_qos(prefetch_count=self.prefetch_count, global_qos=False)
+        
+        # Per-message lookups are bound once as default arguments (fast locals in the callback)
+        def callback(ch, method, properties, body, _ack=self._ack, _transform=self.transform, _str=str):
+            """Callback function for processing received messages"""
+            try:
+                if _transform is not None:
+                    body = _transform(body)
+                    if body is None:
+                        # Filtered out by the transform: acknowledge without handling it
+                        _ack(ch, method.delivery_tag)
+                        return
+                
+                message = _str(body, 'utf-8')
+                
+                # BasicProperties always has a headers attribute (None when absent)
+                headers = properties.headers if properties is not None else None
+                
+                if self.interactive:
                     # Print message in a formatted way
                     self._print_received_message(consumer_tag, message, method.exchange, method.routing_key, headers)
-                    
-                    # Acknowledge message receipt
-                    ch.basic_ack(delivery_tag=method.delivery_tag)
-                    
-                    # For better UX, display menu again
+                else:
+                    logger.debug("Received message by consumer '%s' from exchange: %s with routing key: %s",
+                                 consumer_tag, method.exchange, method.routing_key)
+                
+                # Acknowledge message receipt (batched)
+                _ack(ch, method.delivery_tag)
+                
+                # For better UX, display menu again
+                if self.interactive:
                     self._print_menu()
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Negative acknowledgment to requeue
-                    ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
-            
-            # Start consuming
-            self.active_consumers[consumer_tag] = channel.basic_consume(
-                queue=queue_name,
-                on_message_callback=callback,
-                consumer_tag=consumer_tag,
-                auto_ack=False
-            )
+            except Exception as e:
+                logger.error("Error processing message: %s", e)
+                # Ack what was already processed, then requeue only the failed message
+                self._flush_acks(ch)
+                ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+        
+        # Start consuming
+        self.active_consumers[consumer_tag] = channel.basic_consume(
+            queue=queue_name,
+            on_message_callback=callback,
+            consumer_tag=consumer_tag,
+            auto_ack=False
+        )
+    
+    def _ack(self, channel, delivery_tag):
+        """
+        Records a processed delivery, acknowledging the pending ones once a batch is complete
+        
+        Args:
+            channel (pika.channel.Channel): Channel the delivery arrived on
+            delivery_tag (int): Delivery tag of the processed message
+        """
+        self._pending_acks += 1
+        self._last_delivery_tag = delivery_tag
+        if self._pending_acks >= self.ack_batch:
+            self._flush_acks(channel)
+        elif self._ack_timer is None:
+            self._ack_timer = self._call_later(ACK_FLUSH_INTERVAL, lambda: self._flush_acks(channel))
+    
+    def _call_later(self, delay, callback):
+        """Schedules callback on the connection's event loop (blocking or select)"""
+        if self.use_select:
+            return self.connection.ioloop.call_later(delay, callback)
+        return self.connection.call_later(delay, callback)
+    
+    def _remove_timeout(self, timer):
+        """Cancels a timer created by _call_later"""
+        if self.use_select:
+            self.connection.ioloop.remove_timeout(timer)
+        else:
+            self.connection.remove_timeout(timer)
+    
+    def _flush_acks(self, channel):
+        """
+        Acknowledge every pending delivery up to the last recorded delivery tag
+        
+        Args:
+            channel (pika.channel.Channel): Channel the deliveries arrived on
+        """
+        if self._ack_timer is not None:
+            self._remove_timeout(self._ack_timer)
+            self._ack_timer = None
+        if self._pending_acks:
+            channel.basic_ack(delivery_tag=self._last_delivery_tag, multiple=True)
+            self._pending_acks = 0
+            self._last_delivery_tag = None
     
     def _print_received_message(self, consumer_tag, message, exchange, routing_key, headers=None):
         """
@@ -82,32 +255,34 @@ class MessageConsumer(RabbitMQClient):
             routing_key (str): The routing key used
             headers (dict, optional): Headers from the message properties
         """
-        print("\n")
-        print("##############################################")
-        print("##          MENSAGEM RECEBIDA              ##")
-        print("##############################################")
-        print(f"# Consumer: {consumer_tag}")
-        print(f"# Exchange: {exchange}")
-        print(f"# Routing Key: {routing_key}")
-        print(f"# Mensagem: {message[:100]}..." if len(message) > 100 else f"# Mensagem: {message}")
+        lines = [
+            "\n",
+            "##############################################",
+            "##          MENSAGEM RECEBIDA              ##",
+            "##############################################",
+            f"# Consumer: {consumer_tag}",
+            f"# Exchange: {exchange}",
+            f"# Routing Key: {routing_key}",
+            f"# Mensagem: {message[:100]}..." if len(message) > 100 else f"# Mensagem: {message}",
+        ]
         if headers:
-            print("# Headers:")
-            for key, value in headers.items():
-                print(f"#   {key}: {value}")
-        print("##############################################")
+            lines.append("# Headers:")
+            lines.extend(f"#   {key}: {value}" for key, value in headers.items())
+        lines.append("##############################################\n")
+        
+        # One write/flush instead of a print() (and stdout lock) per line
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
         
-        logger.info(f"Received message by consumer '{consumer_tag}' from exchange: {exchange} with routing key: {routing_key}")
-        logger.debug(f"Message content: '{message}'")
-        logger.debug(f"Headers: {headers}")
+        # The banner already shows consumer, exchange and routing key; only log the details
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Message content: %r", message)
+            logger.debug("Headers: %s", headers)
     
     def _print_menu(self):
         """Helper method to redisplay the menu after message reception"""
-        print("\nSelect exchange type to send message:")
-        print("1. Direct Exchange")
-        print("2. Fanout Exchange")
-        print("3. Topic Exchange")
-        print("0. Exit")
-        print("Enter your choice: ", end="", flush=True)
+        sys.stdout.write(_MENU)
+        sys.stdout.flush()
     
     def stop_consuming(self, consumer_tag=None):
         """
@@ -116,30 +291,65 @@ class MessageConsumer(RabbitMQClient):
         Args:
             consumer_tag (str, optional): Specific consumer to stop. If None, stops all consumers.
         """
+        if self.channel is None:
+            return  # Select mode: the channel is closed, so there is nothing left to cancel
         with self.channel_operation() as channel:
+            self._flush_acks(channel)
             if consumer_tag and consumer_tag in self.active_consumers:
                 channel.basic_cancel(consumer_tag=consumer_tag)
                 del self.active_consumers[consumer_tag]
-                logger.info(f"Stopped consumer: {consumer_tag}")
+                logger.info("Stopped consumer: %s", consumer_tag)
             elif consumer_tag is None:
                 for tag in list(self.active_consumers.keys()):
                     channel.basic_cancel(consumer_tag=tag)
                     del self.active_consumers[tag]
                 logger.info("Stopped all consumers")
     
+    def _run_ioloop(self):
+        """
+        Drives the SelectConnection ioloop until the connection is closed
+        
+        The loop sleeps in select/epoll until the socket is readable. Ctrl-C is turned into
+        a shutdown scheduled on the loop instead of a KeyboardInterrupt raised mid-callback.
+        """
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(
+                signal.SIGINT,
+                lambda signum, frame: self.connection.ioloop.add_callback_threadsafe(self._shutdown)
+            )
+        try:
+            # Callbacks open the channel, start the consumers and deliver messages
+            self._start_ioloop()
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGINT, previous_handler)
+    
+    def _shutdown(self):
+        """Cancels the consumers and closes the select connection, which stops the ioloop"""
+        logger.info("Stopping consumers due to keyboard interrupt")
+        self.stop_consuming()
+        if self.connection.is_open:
+            self.connection.close()
+    
     def run(self):
         """Implementation of abstract method from RabbitMQClient - starts consuming loop"""
-        if not self.active_consumers:
+        if not self.active_consumers and not self._pending_consumers:
             logger.warning("No active consumers to run")
             return
             
         logger.info("Starting to consume messages...")
         try:
-            self.channel.start_consuming()
+            if self.use_select:
+                self._run_ioloop()
+                if self._channel_error is not None:
+                    raise self._channel_error
+            else:
+                self.channel.start_consuming()
         except KeyboardInterrupt:
             logger.info("Stopping consumers due to keyboard interrupt")
             self.stop_consuming()
         except Exception as e:
-            logger.error(f"Error in consume loop: {e}")
+            logger.error("Error in consume loop: %s", e)
             self.stop_consuming()
             raise
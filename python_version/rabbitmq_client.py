@@ -8,40 +8,234 @@ This module provides a common interface for both producers and consumers.
 
 import pika
 import logging
+import queue
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from contextlib import contextmanager
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
 logger = logging.getLogger(__name__)
 
+# BlockingConnections shared by every client built from equivalent connection parameters,
+# keyed by (host, port, vhost, user), so short-lived clients skip the TCP/AMQP handshake.
+# Clients never close them; close_cached_connections() does at shutdown.
+# BlockingConnection is not thread-safe: the lock only guards creating the connection
+_CONNECTION_CACHE = {}
+_CONNECTION_CACHE_LOCK = threading.Lock()
+
+
+def _claim_future(future):
+    """
+    Marks a Future whose work was queued on the ioloop as running
+    
+    Returns:
+        bool: False if the Future was already failed (by a close, or the ioloop stopping)
+              or cancelled before its callback ran, in which case the callback must skip it
+    """
+    return not future.done() and future.set_running_or_notify_cancel()
+
+
+def _set_future_result(future, result):
+    """Resolves future unless a close already failed it"""
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future, error):
+    """Fails future unless it was already resolved or failed"""
+    if not future.done():
+        future.set_exception(error)
+
+
+def _connection_key(connection_params):
+    """Cache key identifying the broker endpoint and user of connection_params"""
+    credentials = getattr(connection_params, 'credentials', None)
+    return (
+        connection_params.host,
+        connection_params.port,
+        connection_params.virtual_host,
+        getattr(credentials, 'username', None)
+    )
+
+
+def get_cached_connection(connection_params):
+    """
+    Returns the shared BlockingConnection for connection_params, (re)connecting when needed
+    
+    Args:
+        connection_params (pika.ConnectionParameters): Connection parameters
+    
+    Returns:
+        pika.BlockingConnection: An open connection
+    """
+    key = _connection_key(connection_params)
+    with _CONNECTION_CACHE_LOCK:
+        connection = _CONNECTION_CACHE.get(key)
+        if connection is None or not connection.is_open:
+            connection = pika.BlockingConnection(connection_params)
+            _CONNECTION_CACHE[key] = connection
+            logger.debug("Created new RabbitMQ connection")
+        return connection
+
+
+def close_cached_connections():
+    """Closes every shared connection; channels opened on them are closed along with them"""
+    with _CONNECTION_CACHE_LOCK:
+        for connection in _CONNECTION_CACHE.values():
+            try:
+                if connection.is_open:
+                    connection.close()
+                    logger.debug("Closed RabbitMQ connection")
+            except Exception as e:
+                logger.error(f"Error closing connection: {e}")
+        _CONNECTION_CACHE.clear()
+
+
+def _in_confirm_mode(channel):
+    """True if publisher confirms were enabled on the (blocking) channel's underlying channel"""
+    impl = getattr(channel, '_impl', None)
+    callbacks = getattr(impl, 'callbacks', None)
+    return bool(callbacks and callbacks.pending(impl.channel_number, pika.spec.Basic.Ack))
+
+
+class ChannelPool:
+    """Pool of open channels multiplexed over the shared connection for a set of parameters"""
+    
+    def __init__(self, connection_params, size=1):
+        """
+        Args:
+            connection_params (pika.ConnectionParameters): Parameters of the shared connection
+            size (int, optional): Channels opened up front whenever the pool binds to a
+                                  (new) connection. More are opened on demand
+        """
+        self.connection_params = connection_params
+        self.size = size
+        self._connection = None
+        self._channels = queue.SimpleQueue()
+    
+    def acquire(self):
+        """
+        Checks out an open channel, opening a new one if the pool is empty
+        
+        Returns:
+            pika.adapters.blocking_connection.BlockingChannel: An open channel
+        """
+        connection = get_cached_connection(self.connection_params)
+        if connection is not self._connection:
+            # Reconnected: channels of the previous connection are gone with it
+            self._connection = connection
+            self._channels = queue.SimpleQueue()
+            for _ in range(self.size):
+                self._channels.put(connection.channel())
+        
+        while True:
+            try:
+                channel = self._channels.get_nowait()
+            except queue.Empty:
+                channel = connection.channel()
+                logger.debug("Created RabbitMQ channel")
+            if channel.is_open:
+                return channel
+            # Closed by the broker: discard it and try the next one
+    
+    def release(self, channel):
+        """
+        Returns a channel to the pool; closed channels are dropped
+        
+        Channels left in publisher confirm mode are closed instead: the broker keeps numbering
+        their delivery tags and the previous user's Ack/Nack callback stays registered, so the
+        next user could not track its own confirms on them.
+        """
+        if not channel.is_open or channel.connection is not self._connection:
+            return
+        if _in_confirm_mode(channel):
+            try:
+                channel.close()
+                logger.debug("Closed RabbitMQ channel left in confirm mode")
+            except Exception as e:
+                logger.error(f"Error closing channel: {e}")
+            return
+        self._channels.put(channel)
+    
+    @contextmanager
+    def channel(self):
+        """
+        Context manager that borrows a channel and returns it to the pool afterwards
+        
+        Yields:
+            pika.adapters.blocking_connection.BlockingChannel: An open channel
+        """
+        channel = self.acquire()
+        try:
+            yield channel
+        finally:
+            self.release(channel)
+
 
 class RabbitMQClient(ABC):
     """Abstract base class for RabbitMQ client operations"""
     
-    def __init__(self, connection_params=None, connection=None):
+    # Seconds to wait for broker replies and publisher confirms before giving up
+    operation_timeout = 30
+    
+    def __init__(self, connection_params=None, connection=None, use_select=False, channel=None):
         """
-        Initialize with either connection parameters or an existing connection
+        Initialize with either connection parameters, an existing connection or an existing channel
         
         Args:
             connection_params (pika.ConnectionParameters, optional): Connection parameters
             connection (pika.BlockingConnection, optional): Existing connection
+            use_select (bool, optional): Use an asynchronous pika.SelectConnection instead of a
+                                         BlockingConnection. Requires connection_params
+            channel (pika.adapters.blocking_connection.BlockingChannel, optional): Existing channel,
+                e.g. borrowed from a channel pool. Its connection is used for recovery
         """
-        self.connection = connection
+        self.connection = connection or (channel.connection if channel is not None else None)
         self.connection_params = connection_params
+        self.use_select = use_select
         self.channel = None
+        self._provided_channel = channel
+        self._channel_ready = threading.Event()
+        self._select_error = None
+        self._pending_rpcs = set()
+        self._ioloop_thread = None
+        self._ioloop_running = False
+        self._owns_connection = False
         self._initialize_channel()
     
+    @staticmethod
+    def configure_logging(level=logging.INFO):
+        """
+        Configures the root logger for scripts using the RabbitMQ clients
+        
+        Importing the clients no longer touches the logging configuration; entry points call
+        this explicitly. Records carry the raw %(created) timestamp, which skips the
+        localtime/strftime call %(asctime)s makes for every record.
+        
+        Args:
+            level (int, optional): Root logger level. Defaults to logging.INFO
+        """
+        logging.basicConfig(
+            level=level,
+            format='%(created).3f - %(name)s - %(levelname)s - %(message)s'
+        )
+    
     def _initialize_channel(self):
         """Initialize the channel from connection"""
-        if not self.connection and self.connection_params:
+        if self.use_select:
+            self._initialize_select_connection()
+            return
+        
+        if self._provided_channel is not None:
+            # Use the caller's channel once; recovery falls back to opening a new one
+            self.channel, self._provided_channel = self._provided_channel, None
+            return
+        
+        if self.connection_params and (not self.connection or not self.connection.is_open):
             try:
-                self.connection = pika.BlockingConnection(self.connection_params)
-                logger.debug("Created new RabbitMQ connection")
+                self.connection = get_cached_connection(self.connection_params)
+                # Shared with other clients: close() must leave it open
+                self._owns_connection = False
             except Exception as e:
                 logger.error(f"Failed to create RabbitMQ connection: {e}")
                 raise
@@ -56,30 +250,283 @@ class RabbitMQClient(ABC):
         else:
             raise ValueError("Either connection or connection_params must be provided")
     
+    def _initialize_select_connection(self):
+        """Create a SelectConnection; the channel is opened from its callbacks once the ioloop runs"""
+        if not self.connection_params:
+            raise ValueError("connection_params must be provided when use_select is enabled")
+        
+        self._channel_ready.clear()
+        self._select_error = None
+        try:
+            self.connection = pika.SelectConnection(
+                self.connection_params,
+                on_open_callback=self._on_connection_open,
+                on_open_error_callback=self._on_connection_open_error,
+                on_close_callback=self._on_connection_closed
+            )
+            logger.debug("Created new RabbitMQ select connection")
+        except Exception as e:
+            logger.error(f"Failed to create RabbitMQ connection: {e}")
+            raise
+    
+    def _on_connection_open(self, connection):
+        """Called by pika once the select connection is open"""
+        connection.channel(on_open_callback=self._on_channel_open)
+    
+    def _on_connection_open_error(self, connection, error):
+        """Called by pika when the select connection could not be established"""
+        logger.error(f"Failed to create RabbitMQ connection: {error}")
+        self._select_error = error
+        self._channel_ready.set()
+        connection.ioloop.stop()
+    
+    def _on_connection_closed(self, connection, reason):
+        """Called by pika when the select connection is closed; fails any RPC still waiting"""
+        logger.debug(f"RabbitMQ connection closed: {reason}")
+        self.channel = None
+        self._fail_pending_rpcs(reason)
+        connection.ioloop.stop()
+    
+    def _on_channel_open(self, channel):
+        """Called by pika once the channel is open; marks the client as ready"""
+        self.channel = channel
+        channel.add_on_close_callback(self._on_channel_closed)
+        logger.debug("Created RabbitMQ channel")
+        self._channel_ready.set()
+    
+    def _on_channel_closed(self, channel, reason):
+        """Called by pika when the channel is closed; fails any RPC still waiting for a reply"""
+        logger.debug(f"RabbitMQ channel closed: {reason}")
+        self.channel = None
+        self._fail_pending_rpcs(reason)
+    
+    def _fail_pending_rpcs(self, reason):
+        """Fails every Future still waiting for the ioloop with reason"""
+        for future in list(self._pending_rpcs):
+            _set_future_exception(future, reason)
+        self._pending_rpcs.clear()
+    
+    def _start_ioloop(self):
+        """Runs the SelectConnection ioloop on the calling thread until it stops"""
+        self._ioloop_running = True
+        try:
+            self.connection.ioloop.start()
+        finally:
+            self._ioloop_running = False
+            # Callbacks scheduled but not run yet will never run now
+            self._fail_pending_rpcs(pika.exceptions.AMQPConnectionError("RabbitMQ ioloop stopped"))
+    
+    def _schedule(self, callback):
+        """
+        Hands callback to the ioloop thread
+        
+        Raises:
+            pika.exceptions.AMQPConnectionError: If the ioloop is not running, so the callback
+                                                 (and anything waiting on it) would never run
+        """
+        if not self._ioloop_running:
+            raise pika.exceptions.AMQPConnectionError("RabbitMQ ioloop is not running")
+        self.connection.ioloop.add_callback_threadsafe(callback)
+    
+    def _submit(self, future, callback):
+        """
+        Schedules callback on the ioloop thread on behalf of future
+        
+        Until it resolves, the Future is failed if the channel or connection closes or the
+        ioloop stops. callback may therefore run for a Future that is already done, and must
+        start with _claim_future(future) to skip it.
+        
+        Raises:
+            pika.exceptions.AMQPConnectionError: If the ioloop is not running
+        """
+        self._pending_rpcs.add(future)
+        future.add_done_callback(self._pending_rpcs.discard)
+        try:
+            self._schedule(callback)
+        except Exception:
+            self._pending_rpcs.discard(future)
+            raise
+    
+    def start_ioloop_thread(self, timeout=None):
+        """
+        Runs the SelectConnection ioloop in a daemon thread and waits for the channel to open
+        
+        Args:
+            timeout (float, optional): Seconds to wait for the channel. Waits forever if None
+        """
+        self._ioloop_thread = threading.Thread(
+            target=self._start_ioloop,
+            name=f"{type(self).__name__}-ioloop",
+            daemon=True
+        )
+        self._ioloop_thread.start()
+        
+        if not self._channel_ready.wait(timeout):
+            raise pika.exceptions.AMQPConnectionError("Timed out waiting for RabbitMQ channel")
+        if self._select_error:
+            raise self._select_error
+    
+    def call_threadsafe(self, fn, *args, **kwargs):
+        """
+        Schedules fn to run on the ioloop thread
+        
+        Returns:
+            concurrent.futures.Future: Resolves with the return value of fn. Fails if the
+                                       connection closes before fn runs
+        
+        Raises:
+            pika.exceptions.AMQPConnectionError: If the ioloop is not running
+        """
+        future = Future()
+        
+        def invoke():
+            if not _claim_future(future):
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                _set_future_exception(future, e)
+            else:
+                _set_future_result(future, result)
+        
+        self._submit(future, invoke)
+        return future
+    
+    def _channel_rpc(self, method_name, **kwargs):
+        """
+        Invokes a synchronous AMQP method (declare, bind, qos...) on the channel
+        
+        With a BlockingConnection the call is made directly. With a SelectConnection it is
+        scheduled on the ioloop and the caller waits for the broker reply.
+        
+        Args:
+            method_name (str): Name of the channel method, e.g. 'exchange_declare'
+            **kwargs: Arguments for the channel method
+        
+        Returns:
+            The reply frame (select) or the method return value (blocking)
+        """
+        if not self.use_select:
+            return getattr(self.channel, method_name)(**kwargs)
+        
+        future = Future()
+        
+        def invoke():
+            if not _claim_future(future):
+                return
+            try:
+                getattr(self.channel, method_name)(
+                    callback=lambda reply: _set_future_result(future, reply), **kwargs)
+            except Exception as e:
+                _set_future_exception(future, e)
+        
+        self._submit(future, invoke)
+        return future.result(self.operation_timeout)
+    
+    def _channel_rpc_pipeline(self, calls):
+        """
+        Issues several synchronous AMQP methods back to back and waits for the last reply only
+        
+        pika holds a synchronous method back until the reply of the previous one arrives, so
+        every call but the last is sent with callback=None (nowait) and goes out immediately.
+        The broker processes the methods of a channel in order: the reply to the last call
+        means all of them succeeded, and a failing one closes the channel instead. The whole
+        sequence costs a single round trip. Every method must accept callback=None as nowait
+        (exchange_declare, queue_declare with a named queue, queue_bind, ...).
+        
+        Args:
+            calls (list): (method_name, kwargs) tuples, e.g. ('queue_bind', {'queue': ...})
+        
+        Returns:
+            The reply frame of the last call, or None if calls is empty
+        """
+        if not calls:
+            return None
+        reply = []
+        
+        def issue(channel, on_reply):
+            for method_name, kwargs in calls[:-1]:
+                getattr(channel, method_name)(callback=None, **kwargs)
+            method_name, kwargs = calls[-1]
+            getattr(channel, method_name)(callback=on_reply, **kwargs)
+        
+        if not self.use_select:
+            # Pipeline on the underlying asynchronous channel, then wait for the last reply
+            issue(self.channel._impl, reply.append)
+            self.channel._flush_output(lambda: reply)
+            return reply[0]
+        
+        future = Future()
+        
+        def invoke():
+            if not _claim_future(future):
+                return
+            try:
+                issue(self.channel, lambda reply: _set_future_result(future, reply))
+            except Exception as e:
+                _set_future_exception(future, e)
+        
+        self._submit(future, invoke)
+        return future.result(self.operation_timeout)
+    
+    def _handle_channel_error(self, error):
+        """
+        Logs an error raised by a channel operation and, in blocking mode, reopens the channel
+        
+        Shared by _with_channel and channel_operation; the caller re-raises the error.
+        
+        Args:
+            error (Exception): The error raised by the operation
+        """
+        if isinstance(error, pika.exceptions.AMQPChannelError):
+            logger.error("Channel error: %s", error)
+        elif isinstance(error, pika.exceptions.AMQPConnectionError):
+            logger.error("Connection error: %s", error)
+        else:
+            logger.error("Unexpected error in channel operation: %s", error)
+            return
+        
+        if not self.use_select:
+            self._initialize_channel()  # Try to recover
+    
+    def _with_channel(self, fn, *args, **kwargs):
+        """
+        Calls fn(channel, *args, **kwargs) with the same error handling as channel_operation
+        
+        A plain method call, without the generator frame of a context manager, for paths that
+        run per message or per batch. channel_operation remains for administrative operations.
+        
+        Returns:
+            The return value of fn
+        """
+        try:
+            return fn(self.channel, *args, **kwargs)
+        except Exception as e:
+            self._handle_channel_error(e)
+            raise
+    
     @contextmanager
     def channel_operation(self):
         """
         Context manager for channel operations to ensure proper error handling
         
+        Used by administrative paths (declarations, setup); hot paths use _with_channel.
+        
         Yields:
             pika.channel.Channel: The active channel
         """
         try:
             yield self.channel
-        except pika.exceptions.AMQPChannelError as e:
-            logger.error(f"Channel error: {e}")
-            self._initialize_channel()  # Try to recover
-            raise
-        except pika.exceptions.AMQPConnectionError as e:
-            logger.error(f"Connection error: {e}")
-            self._initialize_channel()  # Try to recover
-            raise
         except Exception as e:
-            logger.error(f"Unexpected error in channel operation: {e}")
+            self._handle_channel_error(e)
             raise
     
     def close(self):
-        """Close the channel and connection"""
+        """Close the channel (and the connection, in select mode, where each client owns its own)"""
+        if self.use_select:
+            self._close_select_connection()
+            return
+        
         try:
             if self.channel and self.channel.is_open:
                 self.channel.close()
@@ -87,14 +534,32 @@ class RabbitMQClient(ABC):
         except Exception as e:
             logger.error(f"Error closing channel: {e}")
         
-        # Don't close the connection if it was provided externally
-        if self.connection_params and self.connection:
+        # Don't close the connection if it was provided externally or comes from the connection
+        # cache (close_cached_connections() closes the shared ones at shutdown)
+        if self._owns_connection and self.connection:
             try:
-                self.connection.close()
-                logger.debug("Closed RabbitMQ connection")
+                if self.connection.is_open:
+                    self.connection.close()
+                    logger.debug("Closed RabbitMQ connection")
             except Exception as e:
                 logger.error(f"Error closing connection: {e}")
     
+    def _close_select_connection(self):
+        """Close the select connection from the ioloop thread and wait for the ioloop to stop"""
+        if self.connection and self.connection.is_open:
+            try:
+                if self._ioloop_thread and self._ioloop_thread is not threading.current_thread():
+                    self.connection.ioloop.add_callback_threadsafe(self.connection.close)
+                else:
+                    self.connection.close()
+            except Exception as e:
+                logger.error(f"Error closing connection: {e}")
+        
+        if self._ioloop_thread and self._ioloop_thread is not threading.current_thread():
+            self._ioloop_thread.join()
+            self._ioloop_thread = None
+        logger.debug("Closed RabbitMQ connection")
+    
     @abstractmethod
     def run(self):
         """Abstract method to be implemented by subclasses"""
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Checks that the pre-marshalled publish path writes exactly the bytes pika would.
+Run with: python -m unittest test_publish_frames
+"""
+
+import unittest
+
+import pika
+from pika import connection, spec
+
+from producer import MessageProducer, _marshal_publish, _marshal_publish_template
+
+CHANNEL_NUMBER = 3
+BODY_MAX_LENGTH = 16
+PROPERTIES = pika.BasicProperties(
+    content_type='application/json',
+    delivery_mode=1,
+    headers={'eventType': 'test.qa.123', 'x-trade-id': 325257033709}
+)
+BODIES = {
+    'empty': b'',
+    'small': b'{"a":1}',
+    'exact frame': b'x' * BODY_MAX_LENGTH,
+    'multi-frame': bytes(range(256)) * 2 + b'tail',
+}
+
+
+class RecordingConnection:
+    """Stands in for pika's Connection, recording the marshalled frames instead of sending them"""
+    _body_max_length = BODY_MAX_LENGTH
+    _send_message = connection.Connection._send_message
+
+    def __init__(self):
+        self.frames = []
+
+    def _output_marshaled_frames(self, marshaled_frames):
+        self.frames.extend(bytes(marshaled_frame) for marshaled_frame in marshaled_frames)
+
+    def take(self):
+        """Returns everything written so far as one byte string and resets the record"""
+        data, self.frames = b''.join(self.frames), []
+        return data
+
+
+class RecordingImpl:
+    """The asynchronous channel behind RecordingChannel"""
+    channel_number = CHANNEL_NUMBER
+
+    def __init__(self):
+        self.connection = RecordingConnection()
+
+    def _raise_if_not_open(self):
+        pass
+
+
+class RecordingChannel:
+    """Minimal BlockingChannel exposing the internals prepare_publish relies on"""
+    is_open = True
+    connection = None
+
+    def __init__(self):
+        self._impl = RecordingImpl()
+
+    def _flush_output(self, *waiters):
+        pass
+
+
+def pika_frames(recording, body):
+    """Bytes pika's Connection._send_message writes for body"""
+    method = spec.Basic.Publish(exchange='ex', routing_key='rk')
+    recording._send_message(CHANNEL_NUMBER, method, (PROPERTIES, body))
+    return recording.take()
+
+
+class MarshalPublishTest(unittest.TestCase):
+
+    def test_matches_pika(self):
+        template = _marshal_publish_template(CHANNEL_NUMBER, 'ex', 'rk', PROPERTIES)
+        recording = RecordingConnection()
+        for name, body in BODIES.items():
+            with self.subTest(body=name):
+                self.assertEqual(
+                    _marshal_publish(template, CHANNEL_NUMBER, body, BODY_MAX_LENGTH),
+                    pika_frames(recording, body)
+                )
+
+
+class PreparePublishTest(unittest.TestCase):
+
+    def setUp(self):
+        self.channel = RecordingChannel()
+        self.recording = self.channel._impl.connection
+        self.publish = MessageProducer(channel=self.channel).prepare_publish('ex', 'rk', properties=PROPERTIES)
+
+    def test_matches_pika(self):
+        for name, body in BODIES.items():
+            with self.subTest(body=name):
+                self.publish(body)
+                self.assertEqual(self.recording.take(), pika_frames(self.recording, body))
+
+    def test_memoryview_and_str_bodies(self):
+        self.publish(memoryview(BODIES['multi-frame']))
+        self.assertEqual(self.recording.take(), pika_frames(self.recording, BODIES['multi-frame']))
+
+        self.publish('mensagem de teste')
+        self.assertEqual(self.recording.take(), pika_frames(self.recording, 'mensagem de teste'.encode('utf-8')))
+
+
+if __name__ == '__main__':
+    unittest.main()